@@ -52,6 +52,9 @@ setup(
         "discord",
     ],
     extras_require={
+        "zstd": [
+            "zstandard",
+        ],
         "test": [
             "types-PyYAML",
             "mypy",
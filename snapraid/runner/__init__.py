@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 import logging
+import os
 import re
 import smtplib
 import subprocess
+import sys
+from datetime import datetime
 from email import charset
 from email.mime.text import MIMEText
 from io import StringIO, TextIOWrapper
@@ -23,18 +26,27 @@ from .models.log_levels import OUTPUT
 from .models.loggers import Loggers
 from .models.state import State
 from .models.status import Status
+from .models.status.cache import StatusCache
 
 
 class SnapraidRunner:
     def __init__(self) -> None:
         self.cli_args = CLIArgs().parse_args()
         self.config = self._get_config()
-        self.loggers = Loggers.create_loggers(self.config)
+        self.run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        # status is a quick read for monitoring, so it only logs to the console
+        self.loggers = Loggers.create_loggers(
+            self.config, self.run_id, console_only=self.cli_args.command == Command.STATUS.value
+        )
+        self.status_cache = (
+            StatusCache(self.config.status_cache, self.config.config) if self.config.status_cache else None
+        )
         self.state = State.SUCCESS
         self.diff_output: Optional[Diff] = None
         self.status_output: Optional[Status] = None
         self.error: Optional[str] = None
-        logging.log(OUTPUT, self.config)
+        if self.cli_args.command != Command.STATUS.value:
+            logging.log(OUTPUT, self.config)
 
     def _get_config(self) -> Config:
         with open(self.cli_args.config, encoding="utf-8") as f:
@@ -56,7 +68,23 @@ class SnapraidRunner:
         return self.run_snapraid(Command.SCRUB, scrub_args)
 
     def status(self) -> Status:
-        return Status.parse_status(self.run_snapraid(Command.STATUS))
+        if not self.status_cache:
+            return Status.parse_status(self.run_snapraid(Command.STATUS))
+
+        fingerprint = self.status_cache.fingerprint()
+        if (status := self.status_cache.load(fingerprint)) is not None:
+            logging.info("Content files unchanged, using cached status")
+            logging.log(OUTPUT, status)
+            return status
+
+        status = Status.parse_status(self.run_snapraid(Command.STATUS))
+        self.status_cache.store(status, fingerprint)
+        return status
+
+    def cached_status(self) -> Optional[Status]:
+        if not self.status_cache:
+            return None
+        return self.status_cache.load(self.status_cache.fingerprint())
 
     def diff(self) -> Diff:
         output = self.run_snapraid(Command.DIFF)
@@ -185,11 +213,30 @@ class SnapraidRunner:
 
         self.config.notify.discord.webhook.send(embed=embed)
 
+def show_status(snapraid_runner: SnapraidRunner) -> int:
+    if not snapraid_runner.cli_args.cached:
+        # Logged by status() either as the snapraid output or the cached status
+        return 1 if snapraid_runner.status().error else 0
+
+    if not snapraid_runner.status_cache:
+        logging.error("status --cached requires status_cache to be configured")
+        return 1
+    status = snapraid_runner.cached_status()
+    if status is None:
+        logging.error("No up to date cached status, run status without --cached to refresh it")
+        return 1
+
+    logging.info(status)
+    return 1 if status.error else 0
+
 def main() -> None:
     snapraid_runner = SnapraidRunner()
+    if snapraid_runner.cli_args.command == Command.STATUS.value:
+        sys.exit(show_status(snapraid_runner))
+
     try:
         logging.info("=" * 60)
-        logging.info("Run started")
+        logging.info("Run %s started", snapraid_runner.run_id)
         logging.info("=" * 60)
         diff = snapraid_runner.diff()
         if diff.changes:
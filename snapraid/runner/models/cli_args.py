@@ -1,7 +1,36 @@
-from typing import Optional
+from typing import Any, Optional
 from tap import Tap
 
+class StatusArgs(Tap):
+    cached: bool = False # Only read the cached status, never run snapraid
+
 class CLIArgs(Tap):
     config: str = "/etc/snapraid-runner.yml"
     scrub: Optional[bool] = None
     ignore_delete_threshold: bool = False
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # Set by the subcommands, kept off the class so Tap doesn't add them as top-level options
+        self._command: Optional[str] = None
+        self._cached = False
+        super().__init__(*args, **kwargs)
+
+    def configure(self) -> None:
+        self.add_subparsers(dest="command", help="Run a single command instead of the full run")
+        self.add_subparser("status", StatusArgs, help="Show the snapraid status")
+
+    @property
+    def command(self) -> Optional[str]:
+        return self._command
+
+    @command.setter
+    def command(self, command: Optional[str]) -> None:
+        self._command = command
+
+    @property
+    def cached(self) -> bool:
+        return self._cached
+
+    @cached.setter
+    def cached(self, cached: bool) -> None:
+        self._cached = cached
@@ -0,0 +1,287 @@
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Iterator, Optional
+
+from .config.compression import Compression
+
+if sys.platform != "win32":
+    import fcntl
+
+ROTATED_TIME_FORMAT = "%Y%m%d-%H%M%S-%f"
+# Leftovers younger than this may still be in use by another running process
+RECOVER_AFTER = timedelta(minutes=5)
+
+
+class CompressedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int,
+        run_id: str,
+        *,
+        backup_count: int = 9,
+        compression: Optional[Compression] = None,
+        max_total_size: Optional[int] = None,
+        max_age: Optional[int] = None,
+    ) -> None:
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self.run_id = run_id
+        self.compression = compression
+        self.max_total_size = max_total_size
+        self.max_age = max_age
+        self.index_file = self.index_path(self.baseFilename)
+
+        # Other processes (e.g. a status check) may log to the same file, so rotation,
+        # writes and index updates are serialized with a lock file as well as a thread lock
+        self._lock_file = open( # pylint: disable=consider-using-with
+            f"{self.baseFilename}.index.lock", "a", encoding="utf-8"
+        )
+        self._lock_depth = 0
+        self._index_lock = threading.RLock()
+        self._recorded = False
+        self._queue: queue.Queue[Optional[str]] = queue.Queue()
+        self._worker = threading.Thread(target=self._work, name="log-compressor", daemon=True)
+        self._worker.start()
+
+        # Pick up backups left over by an interrupted run or an older version, then prune
+        for backup in self._recover():
+            self._queue.put(backup)
+        self._queue.put("")
+
+    @staticmethod
+    def index_path(filename: str) -> str:
+        return f"{os.path.abspath(filename)}.index.json"
+
+    @classmethod
+    def lookup(cls, filename: str, run_id: str) -> list[str]:
+        index = cls._load_index(cls.index_path(filename))
+        directory = os.path.dirname(os.path.abspath(filename))
+        files = [
+            os.path.join(directory, backup["file"])
+            for backup in index["backups"]
+            if run_id in backup["runs"]
+        ]
+        if run_id in index["active"]:
+            files.append(os.path.abspath(filename))
+        return files
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            with self._locked():
+                self._reopen_if_rotated()
+                if not self._recorded:
+                    self._recorded = True
+                    index = self._read_index()
+                    if self.run_id not in index["active"]:
+                        index["active"].append(self.run_id)
+                        self._write_index(index)
+                super().emit(record)
+        except Exception: # pylint: disable=broad-exception-caught
+            self.handleError(record)
+
+    def doRollover(self) -> None:
+        with self._locked():
+            if self.stream:
+                self.stream.close()
+                self.stream = None
+
+            if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+                rotated = datetime.now()
+                backup = f"{self.baseFilename}.{rotated.strftime(ROTATED_TIME_FORMAT)}"
+                os.rename(self.baseFilename, backup)
+                index = self._read_index()
+                index["backups"].append({
+                    "file": os.path.basename(backup),
+                    "runs": index["active"],
+                    "rotated": rotated.isoformat(),
+                })
+                index["active"] = [self.run_id]
+                self._write_index(index)
+                self._queue.put(backup)
+
+            if not self.delay:
+                self.stream = self._open()
+
+    def close(self) -> None:
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+        self._lock_file.close()
+        super().close()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._index_lock:
+            self._lock_depth += 1
+            try:
+                if self._lock_depth == 1 and sys.platform != "win32":
+                    fcntl.flock(self._lock_file, fcntl.LOCK_EX) # pylint: disable=possibly-used-before-assignment
+                yield
+            finally:
+                if self._lock_depth == 1 and sys.platform != "win32":
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN) # pylint: disable=possibly-used-before-assignment
+                self._lock_depth -= 1
+
+    def _reopen_if_rotated(self) -> None:
+        # Another process may have rotated the file since this one last wrote to it
+        if not self.stream:
+            return
+        try:
+            current = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            current = None
+        opened = os.fstat(self.stream.fileno())
+        if current is None or (current.st_dev, current.st_ino) != (opened.st_dev, opened.st_ino):
+            self.stream.close()
+            self.stream = self._open()
+            self._recorded = False
+
+    def _work(self) -> None:
+        while (backup := self._queue.get()) is not None:
+            try:
+                if backup:
+                    self._compress(backup)
+                self._prune()
+            except Exception: # pylint: disable=broad-exception-caught
+                self.handleError(logging.makeLogRecord({"msg": f"Failed to process log backup {backup!r}"}))
+
+    def _recover(self) -> list[str]:
+        directory = os.path.dirname(self.baseFilename)
+        prefix = f"{os.path.basename(self.baseFilename)}."
+        recover_before = datetime.now() - RECOVER_AFTER
+        with self._locked():
+            index = self._read_index()
+            indexed = {backup["file"] for backup in index["backups"]}
+            adopted = []
+            for name in os.listdir(directory):
+                if not name.startswith(prefix):
+                    continue
+                modified = datetime.fromtimestamp(os.path.getmtime(os.path.join(directory, name)))
+                if name.endswith(".tmp"):
+                    if modified < recover_before:
+                        os.remove(os.path.join(directory, name))
+                elif name not in indexed and (rotated := self._rotated(name[len(prefix):], modified)):
+                    # Backup missing from the index, either numbered by the plain
+                    # RotatingFileHandler or lost by a crash during rotation
+                    adopted.append({
+                        "file": name,
+                        "runs": [],
+                        "rotated": rotated.isoformat(),
+                    })
+
+            if adopted:
+                index["backups"] = sorted(index["backups"] + adopted, key=lambda backup: backup["rotated"])
+                self._write_index(index)
+
+            return [
+                os.path.join(directory, backup["file"])
+                for backup in index["backups"]
+                if not self._compressed(backup) and datetime.fromisoformat(backup["rotated"]) < recover_before
+            ]
+
+    @staticmethod
+    def _rotated(suffix: str, modified: datetime) -> Optional[datetime]:
+        if suffix.isdigit():
+            return modified
+        for compression in Compression:
+            suffix = suffix.removesuffix(compression.extension)
+        try:
+            return datetime.strptime(suffix, ROTATED_TIME_FORMAT)
+        except ValueError:
+            return None
+
+    def _compressed(self, backup: dict[str, Any]) -> bool:
+        return self.compression is None or str(backup["file"]).endswith(self.compression.extension)
+
+    def _compress(self, backup: str) -> None:
+        if self.compression is None:
+            return
+
+        with self._locked():
+            # Skip backups that were pruned or compressed while they were queued
+            index = self._read_index()
+            if os.path.basename(backup) not in {entry["file"] for entry in index["backups"]}:
+                return
+            if not os.path.exists(backup):
+                index["backups"] = [entry for entry in index["backups"] if entry["file"] != os.path.basename(backup)]
+                self._write_index(index)
+                return
+
+        compressed = f"{backup}{self.compression.extension}"
+        with open(backup, "rb") as f_in, open(f"{compressed}.tmp", "wb") as f_out:
+            if self.compression == Compression.GZIP:
+                with gzip.GzipFile(fileobj=f_out, mode="wb") as gzip_out:
+                    shutil.copyfileobj(f_in, gzip_out)
+            else:
+                import zstandard # pylint: disable=import-outside-toplevel,import-error
+                zstandard.ZstdCompressor().copy_stream(f_in, f_out)
+
+        with self._locked():
+            os.replace(f"{compressed}.tmp", compressed)
+            os.remove(backup)
+            index = self._read_index()
+            for entry in index["backups"]:
+                if entry["file"] == os.path.basename(backup):
+                    entry["file"] = os.path.basename(compressed)
+            self._write_index(index)
+
+    def _prune(self) -> None:
+        directory = os.path.dirname(self.baseFilename)
+        with self._locked():
+            index = self._read_index()
+            # Backups still waiting for compression are left alone until the worker reaches them
+            backups = [backup for backup in index["backups"] if self._compressed(backup)]
+            sizes = [self._size(os.path.join(directory, backup["file"])) for backup in backups]
+            min_rotated = datetime.now() - timedelta(days=self.max_age) if self.max_age is not None else None
+
+            # Backups are ordered oldest first, so drop from the front until everything fits
+            pruned = []
+            while backups and any([
+                0 < self.backupCount < len(backups),
+                self.max_total_size is not None and sum(sizes) > self.max_total_size * 1024,
+                min_rotated is not None and datetime.fromisoformat(backups[0]["rotated"]) < min_rotated,
+            ]):
+                backup = backups.pop(0)
+                sizes.pop(0)
+                pruned.append(backup)
+                try:
+                    os.remove(os.path.join(directory, backup["file"]))
+                except FileNotFoundError:
+                    pass
+
+            if pruned:
+                index["backups"] = [backup for backup in index["backups"] if backup not in pruned]
+                self._write_index(index)
+
+    @staticmethod
+    def _size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except FileNotFoundError:
+            return 0
+
+    def _read_index(self) -> dict[str, Any]:
+        return self._load_index(self.index_file)
+
+    @staticmethod
+    def _load_index(index_file: str) -> dict[str, Any]:
+        try:
+            with open(index_file, encoding="utf-8") as f:
+                index: dict[str, Any] = json.load(f)
+                return index
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"active": [], "backups": []}
+
+    def _write_index(self, index: dict[str, Any]) -> None:
+        with open(f"{self.index_file}.tmp", "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+        os.replace(f"{self.index_file}.tmp", self.index_file)
@@ -16,6 +16,7 @@ class Config:
     logging: Optional[Logging] = None
     touch: bool = False
     delete_threshold: Optional[int] = None
+    status_cache: Optional[str] = None
     notify: Notify = field(factory=Notify)
     scrub: list[Scrub] = field(factory=list)
 
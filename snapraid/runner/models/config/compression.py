@@ -0,0 +1,12 @@
+from enum import Enum
+
+class Compression(Enum):
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+    @property
+    def extension(self) -> str:
+        return {
+            Compression.GZIP: ".gz",
+            Compression.ZSTD: ".zst",
+        }[self]
@@ -1,6 +1,22 @@
+from importlib.util import find_spec
+from logging import error
+from typing import Optional
+
 from attrs import define
 
+from .compression import Compression
+
 @define
 class Logging:
     file: str
     max_size: int
+    backup_count: int = 9
+    compression: Optional[Compression] = None
+    max_total_size: Optional[int] = None
+    max_age: Optional[int] = None
+
+    def __attrs_post_init__ (self) -> None:
+        if self.compression == Compression.ZSTD and find_spec("zstandard") is None:
+            error_string = "zstd log compression requires the zstandard package, install snapraid-runner[zstd]"
+            error(error_string)
+            raise RuntimeError(error_string)
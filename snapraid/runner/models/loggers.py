@@ -1,10 +1,10 @@
 from attrs import define
 from io import StringIO
 import logging
-import logging.handlers
 import sys
 from typing import Optional
 
+from .compressed_rotating_file_handler import CompressedRotatingFileHandler
 from .config import Config
 from .log_levels import OUTPUT, OUTERR
 
@@ -13,11 +13,11 @@ from .log_levels import OUTPUT, OUTERR
 class Loggers:
     root_logger: logging.Logger
     console_logger: logging.StreamHandler
-    file_logger: Optional[logging.handlers.RotatingFileHandler] = None
+    file_logger: Optional[CompressedRotatingFileHandler] = None
     email_logger: Optional[logging.StreamHandler] = None
 
     @classmethod
-    def create_loggers(cls, config: Config) -> "Loggers":
+    def create_loggers(cls, config: Config, run_id: str, console_only: bool = False) -> "Loggers":
         log_format = logging.Formatter("%(asctime)s [%(levelname)-6.6s] %(message)s")
         root_logger = logging.getLogger()
         logging.addLevelName(OUTPUT, "OUTPUT")
@@ -32,11 +32,19 @@ class Loggers:
         file_logger = None
         email_logger = None
 
+        if console_only:
+            return cls(root_logger, console_logger)
+
         if config.logging:
-            file_logger = logging.handlers.RotatingFileHandler(
+            file_logger = CompressedRotatingFileHandler(
                 config.logging.file,
-                maxBytes=max(config.logging.max_size, 0) * 1024,
-                backupCount=9)
+                max_bytes=max(config.logging.max_size, 0) * 1024,
+                run_id=run_id,
+                backup_count=config.logging.backup_count,
+                compression=config.logging.compression,
+                max_total_size=config.logging.max_total_size,
+                max_age=config.logging.max_age,
+            )
             file_logger.setFormatter(log_format)
             root_logger.addHandler(file_logger)
 
@@ -0,0 +1,88 @@
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from typing import Any, Optional
+
+from attrs import define, evolve
+from cattrs import structure, unstructure
+from cattrs.errors import BaseValidationError
+
+from . import Status
+
+CONTENT_REGEX = r"^\s*content\s+(?P<path>\S.*?)\s*$"
+
+
+@define
+class StatusCache:
+    file: str
+    snapraid_config: str
+
+    def content_files(self) -> list[str]:
+        with open(self.snapraid_config, encoding="utf-8") as f:
+            return [
+                content_match.group("path")
+                for line in f
+                if (content_match := re.match(CONTENT_REGEX, line))
+            ]
+
+    def fingerprint(self) -> Optional[list[dict[str, Any]]]:
+        # snapraid rewrites every content file on sync, scrub and touch,
+        # so any of those changes the fingerprint and invalidates the cache
+        try:
+            content_files = self.content_files()
+            fingerprint = []
+            for content_file in content_files:
+                stat = os.stat(content_file)
+                fingerprint.append({
+                    "path": content_file,
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime_ns,
+                    "inode": stat.st_ino,
+                })
+        except OSError as e_string:
+            logging.warning("Unable to fingerprint snapraid content files: %s", e_string)
+            return None
+
+        return fingerprint or None
+
+    def load(self, fingerprint: Optional[list[dict[str, Any]]]) -> Optional[Status]:
+        if fingerprint is None:
+            return None
+
+        try:
+            with open(self.file, encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache["fingerprint"] != fingerprint:
+                return None
+            status = structure(cache["status"], Status)
+            # Scrub ages are counted in days from when snapraid status ran
+            elapsed_days = (datetime.now() - datetime.fromisoformat(cache["cached"])).days
+            return evolve(status, scrub_age=evolve(
+                status.scrub_age,
+                oldest=status.scrub_age.oldest + elapsed_days,
+                median=status.scrub_age.median + elapsed_days,
+                newest=status.scrub_age.newest + elapsed_days,
+            ))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError, BaseValidationError) as e_string:
+            logging.warning("Ignoring unreadable status cache %r: %s", self.file, e_string)
+            return None
+
+    def store(self, status: Status, fingerprint: Optional[list[dict[str, Any]]]) -> None:
+        if fingerprint is None:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.file)), exist_ok=True)
+            with open(f"{self.file}.tmp", "w", encoding="utf-8") as f:
+                json.dump({
+                    "fingerprint": fingerprint,
+                    "cached": datetime.now().isoformat(),
+                    "status": unstructure(status),
+                }, f)
+            os.replace(f"{self.file}.tmp", self.file)
+        except OSError as e_string:
+            logging.warning("Unable to write status cache %r: %s", self.file, e_string)
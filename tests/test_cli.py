@@ -0,0 +1,92 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from attrs import evolve
+
+from snapraid.runner import SnapraidRunner, show_status
+from snapraid.runner.models.cli_args import CLIArgs
+from snapraid.runner.models.log_levels import OUTPUT
+from snapraid.runner.models.status import Status
+from snapraid.runner.models.status.cache import StatusCache
+
+from .test_parse_status import PERFECT_STATE
+
+
+class TestCLIArgs(TestCase):
+    def test_full_run(self) -> None:
+        args = CLIArgs().parse_args(["--config", "runner.yml"])
+        assert args.config == "runner.yml"
+        assert args.command is None
+        assert args.cached is False
+
+    def test_status(self) -> None:
+        args = CLIArgs().parse_args(["status"])
+        assert args.command == "status"
+        assert args.cached is False
+
+    def test_status_cached(self) -> None:
+        args = CLIArgs().parse_args(["--config", "runner.yml", "status", "--cached"])
+        assert args.config == "runner.yml"
+        assert args.command == "status"
+        assert args.cached is True
+
+    def test_no_top_level_status_options(self) -> None:
+        for args in (["--cached"], ["--command", "status"]):
+            with self.assertRaises(SystemExit):
+                CLIArgs().parse_args(args)
+
+
+class TestShowStatus(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory() # pylint: disable=consider-using-with
+        self.content_file = os.path.join(self.directory.name, "snapraid.content")
+        with open(self.content_file, "w", encoding="utf-8") as f:
+            f.write("content")
+        snapraid_config = os.path.join(self.directory.name, "snapraid.conf")
+        with open(snapraid_config, "w", encoding="utf-8") as f:
+            f.write(f"content {self.content_file}\n")
+
+        self.snapraid_runner = SnapraidRunner.__new__(SnapraidRunner)
+        self.snapraid_runner.cli_args = CLIArgs().parse_args(["status", "--cached"])
+        self.snapraid_runner.status_cache = StatusCache(
+            os.path.join(self.directory.name, "status.json"), snapraid_config
+        )
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _exit_code(self) -> int:
+        return show_status(self.snapraid_runner)
+
+    def _store(self, status: Status) -> None:
+        assert self.snapraid_runner.status_cache is not None
+        self.snapraid_runner.status_cache.store(status, self.snapraid_runner.status_cache.fingerprint())
+
+    def test_cached(self) -> None:
+        self._store(Status.parse_status(PERFECT_STATE))
+        assert self._exit_code() == 0
+
+    def test_status_cache_hit_logged(self) -> None:
+        self.snapraid_runner.cli_args = CLIArgs().parse_args(["status"])
+        self._store(Status.parse_status(PERFECT_STATE))
+        with self.assertLogs(level=OUTPUT) as logs:
+            assert self._exit_code() == 0
+        assert any("Sync in progress: False" in line for line in logs.output)
+
+    def test_cache_missing(self) -> None:
+        assert self._exit_code() == 1
+
+    def test_cache_not_configured(self) -> None:
+        self.snapraid_runner.status_cache = None
+        assert self._exit_code() == 1
+
+    def test_cache_stale(self) -> None:
+        self._store(Status.parse_status(PERFECT_STATE))
+        with open(self.content_file, "a", encoding="utf-8") as f:
+            f.write("synced")
+        assert self._exit_code() == 1
+
+    def test_status_error(self) -> None:
+        self._store(evolve(Status.parse_status(PERFECT_STATE), error=True))
+        assert self._exit_code() == 1
@@ -0,0 +1,228 @@
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from tempfile import TemporaryDirectory
+from typing import Any
+from unittest import TestCase
+from unittest.mock import patch
+
+from snapraid.runner.models.compressed_rotating_file_handler import (
+    ROTATED_TIME_FORMAT,
+    CompressedRotatingFileHandler,
+)
+from snapraid.runner.models.config.compression import Compression
+from snapraid.runner.models.config.logging import Logging
+
+
+class TestCompressedRotatingFileHandler(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory() # pylint: disable=consider-using-with
+        self.log_file = os.path.join(self.directory.name, "snapraid.log")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _log(self, handler: CompressedRotatingFileHandler, lines: int) -> None:
+        for i in range(lines):
+            handler.emit(logging.makeLogRecord({"msg": f"line {i:04d} " + "x" * 100}))
+
+    def _index(self) -> dict[str, Any]:
+        with open(CompressedRotatingFileHandler.index_path(self.log_file), encoding="utf-8") as f:
+            index: dict[str, Any] = json.load(f)
+            return index
+
+    def _write_index(self, index: dict[str, Any]) -> None:
+        with open(CompressedRotatingFileHandler.index_path(self.log_file), "w", encoding="utf-8") as f:
+            json.dump(index, f)
+
+    def test_rotated_logs_are_compressed(self) -> None:
+        handler = CompressedRotatingFileHandler(
+            self.log_file, max_bytes=1024, run_id="run1", compression=Compression.GZIP
+        )
+        self._log(handler, 20)
+        handler.close()
+
+        backups = CompressedRotatingFileHandler.lookup(self.log_file, "run1")
+        assert backups[-1] == self.log_file
+        assert len(backups) > 1
+        for backup in backups[:-1]:
+            assert backup.endswith(".gz")
+            with gzip.open(backup, "rt", encoding="utf-8") as f:
+                assert f.read().startswith("line")
+        assert not [name for name in os.listdir(self.directory.name) if name.endswith(".tmp")]
+
+    def test_backup_count(self) -> None:
+        handler = CompressedRotatingFileHandler(self.log_file, max_bytes=1024, run_id="run1", backup_count=2)
+        self._log(handler, 50)
+        handler.close()
+
+        index = self._index()
+        assert len(index["backups"]) == 2
+        assert sorted(os.listdir(self.directory.name)) == sorted(
+            [backup["file"] for backup in index["backups"]]
+            + ["snapraid.log", "snapraid.log.index.json", "snapraid.log.index.lock"]
+        )
+
+    def test_backup_count_compressed(self) -> None:
+        handler = CompressedRotatingFileHandler(
+            self.log_file, max_bytes=1024, run_id="run1", backup_count=2, compression=Compression.GZIP
+        )
+        with patch.object(handler, "handleError") as handle_error:
+            self._log(handler, 300)
+            handler.close()
+        handle_error.assert_not_called()
+
+        index = self._index()
+        assert len(index["backups"]) == 2
+        assert all(backup["file"].endswith(".gz") for backup in index["backups"])
+        assert sorted(os.listdir(self.directory.name)) == sorted(
+            [backup["file"] for backup in index["backups"]]
+            + ["snapraid.log", "snapraid.log.index.json", "snapraid.log.index.lock"]
+        )
+
+    def test_max_age(self) -> None:
+        handler = CompressedRotatingFileHandler(self.log_file, max_bytes=1024, run_id="run1")
+        self._log(handler, 20)
+        handler.close()
+
+        index = self._index()
+        old_backup = index["backups"][0]["file"]
+        index["backups"][0]["rotated"] = (datetime.now() - timedelta(days=3)).isoformat()
+        self._write_index(index)
+
+        handler = CompressedRotatingFileHandler(self.log_file, max_bytes=1024, run_id="run2", max_age=2)
+        handler.close()
+
+        assert old_backup not in [backup["file"] for backup in self._index()["backups"]]
+        assert not os.path.exists(os.path.join(self.directory.name, old_backup))
+        assert self._index()["backups"]
+
+    def test_recover_interrupted_compression(self) -> None:
+        handler = CompressedRotatingFileHandler(self.log_file, max_bytes=1024, run_id="run1")
+        self._log(handler, 20)
+        handler.close()
+
+        index = self._index()
+        rotated = (datetime.now() - timedelta(hours=1)).isoformat()
+        for backup in index["backups"]:
+            backup["rotated"] = rotated
+        self._write_index(index)
+        stale_tmp = os.path.join(self.directory.name, f"{index['backups'][0]['file']}.gz.tmp")
+        with open(stale_tmp, "w", encoding="utf-8") as f:
+            f.write("partial")
+        os.utime(stale_tmp, (time.time() - 3600, time.time() - 3600))
+
+        handler = CompressedRotatingFileHandler(
+            self.log_file, max_bytes=1024, run_id="run2", compression=Compression.GZIP
+        )
+        handler.close()
+
+        assert not os.path.exists(stale_tmp)
+        for backup in self._index()["backups"]:
+            assert backup["file"].endswith(".gz")
+            assert os.path.exists(os.path.join(self.directory.name, backup["file"]))
+
+    def test_legacy_backups(self) -> None:
+        for i in range(1, 4):
+            with open(f"{self.log_file}.{i}", "w", encoding="utf-8") as f:
+                f.write(f"backup {i}")
+            os.utime(f"{self.log_file}.{i}", (time.time() - 3600 * (i + 1), time.time() - 3600 * (i + 1)))
+
+        handler = CompressedRotatingFileHandler(
+            self.log_file, max_bytes=1024, run_id="run1", backup_count=2, compression=Compression.GZIP
+        )
+        handler.close()
+
+        assert [backup["file"] for backup in self._index()["backups"]] == [
+            "snapraid.log.2.gz", "snapraid.log.1.gz"
+        ]
+        assert not os.path.exists(f"{self.log_file}.3")
+
+    def test_shared_log_file(self) -> None:
+        main_handler = CompressedRotatingFileHandler(
+            self.log_file, max_bytes=4096, run_id="main", compression=Compression.GZIP
+        )
+        self._log(main_handler, 30)
+        status_handler = CompressedRotatingFileHandler(
+            self.log_file, max_bytes=4096, run_id="status", compression=Compression.GZIP
+        )
+        # The status handler rotates the file the main handler still has open
+        self._log(status_handler, 10)
+        status_handler.close()
+        for i in range(5):
+            main_handler.emit(logging.makeLogRecord({"msg": f"main-after {i}"}))
+        main_handler.close()
+
+        logs = ""
+        for log in CompressedRotatingFileHandler.lookup(self.log_file, "main"):
+            if log.endswith(".gz"):
+                with gzip.open(log, "rt", encoding="utf-8") as f:
+                    logs += f.read()
+            else:
+                with open(log, encoding="utf-8") as f:
+                    logs += f.read()
+        assert all(f"main-after {i}" in logs for i in range(5))
+
+    def test_adopt_unindexed_backup(self) -> None:
+        rotated = datetime.now() - timedelta(hours=1)
+        orphan = f"{self.log_file}.{rotated.strftime(ROTATED_TIME_FORMAT)}"
+        with open(orphan, "w", encoding="utf-8") as f:
+            f.write("lost during rotation")
+
+        handler = CompressedRotatingFileHandler(
+            self.log_file, max_bytes=1024, run_id="run1", compression=Compression.GZIP
+        )
+        handler.close()
+
+        assert [backup["file"] for backup in self._index()["backups"]] == [f"{os.path.basename(orphan)}.gz"]
+        assert not os.path.exists(orphan)
+
+    def test_lookup_corrupt_index(self) -> None:
+        with open(CompressedRotatingFileHandler.index_path(self.log_file), "w", encoding="utf-8") as f:
+            f.write("{")
+        assert not CompressedRotatingFileHandler.lookup(self.log_file, "run1")
+
+    def test_run_recorded_on_first_record(self) -> None:
+        CompressedRotatingFileHandler(self.log_file, max_bytes=1024, run_id="run1").close()
+        assert not CompressedRotatingFileHandler.lookup(self.log_file, "run1")
+
+        handler = CompressedRotatingFileHandler(self.log_file, max_bytes=1024, run_id="run2")
+        self._log(handler, 1)
+        handler.close()
+        assert self._index()["active"] == ["run2"]
+
+    def test_max_total_size(self) -> None:
+        handler = CompressedRotatingFileHandler(
+            self.log_file, max_bytes=1024, run_id="run1", backup_count=0, max_total_size=3
+        )
+        self._log(handler, 100)
+        handler.close()
+
+        backups = CompressedRotatingFileHandler.lookup(self.log_file, "run1")[:-1]
+        assert sum(os.path.getsize(backup) for backup in backups) <= 3 * 1024
+
+    def test_lookup_by_run(self) -> None:
+        handler = CompressedRotatingFileHandler(self.log_file, max_bytes=1024, run_id="run1")
+        self._log(handler, 5)
+        handler.close()
+        handler = CompressedRotatingFileHandler(self.log_file, max_bytes=1024, run_id="run2")
+        self._log(handler, 20)
+        handler.close()
+
+        run1 = CompressedRotatingFileHandler.lookup(self.log_file, "run1")
+        run2 = CompressedRotatingFileHandler.lookup(self.log_file, "run2")
+        assert len(run1) == 1
+        assert run1[0] in run2
+        assert self.log_file not in run1
+        assert self.log_file in run2
+        assert not CompressedRotatingFileHandler.lookup(self.log_file, "run3")
+
+
+class TestLoggingConfig(TestCase):
+    def test_zstd_requires_zstandard(self) -> None:
+        with patch("snapraid.runner.models.config.logging.find_spec", return_value=None):
+            with self.assertRaises(RuntimeError):
+                Logging("snapraid.log", 1024, compression=Compression.ZSTD)
@@ -0,0 +1,79 @@
+import json
+import os
+from datetime import datetime, timedelta
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from snapraid.runner.models.status import Status
+from snapraid.runner.models.status.cache import StatusCache
+from snapraid.runner.models.status.scrub_age import ScrubAge
+
+from .test_parse_status import PERFECT_STATE
+
+
+class TestStatusCache(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory() # pylint: disable=consider-using-with
+        self.content_files = [
+            os.path.join(self.directory.name, "snapraid.content"),
+            os.path.join(self.directory.name, "disk1", "snapraid.content"),
+        ]
+        os.makedirs(os.path.join(self.directory.name, "disk1"))
+        for content_file in self.content_files:
+            with open(content_file, "w", encoding="utf-8") as f:
+                f.write("content")
+
+        snapraid_config = os.path.join(self.directory.name, "snapraid.conf")
+        with open(snapraid_config, "w", encoding="utf-8") as f:
+            f.write(
+                "parity /mnt/parity/snapraid.parity\n"
+                "# content /mnt/ignored/snapraid.content\n"
+                f"content {self.content_files[0]}\n"
+                f"  content   {self.content_files[1]}  \n"
+                "data d1 /mnt/disk1/\n"
+            )
+
+        self.cache = StatusCache(os.path.join(self.directory.name, "cache", "status.json"), snapraid_config)
+        self.status = Status.parse_status(PERFECT_STATE)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_content_files(self) -> None:
+        assert self.cache.content_files() == self.content_files
+
+    def test_hit(self) -> None:
+        assert self.cache.load(self.cache.fingerprint()) is None
+        self.cache.store(self.status, self.cache.fingerprint())
+        assert self.cache.load(self.cache.fingerprint()) == self.status
+
+    def test_scrub_age_advances(self) -> None:
+        self.cache.store(self.status, self.cache.fingerprint())
+        with open(self.cache.file, encoding="utf-8") as f:
+            cache = json.load(f)
+        cache["cached"] = (datetime.now() - timedelta(days=2, hours=1)).isoformat()
+        with open(self.cache.file, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+
+        status = self.cache.load(self.cache.fingerprint())
+        assert status is not None
+        assert status.scrub_age == ScrubAge(9, 5, 2)
+        assert status.report == self.status.report
+
+    def test_invalidated_by_content_change(self) -> None:
+        self.cache.store(self.status, self.cache.fingerprint())
+        with open(self.content_files[1], "a", encoding="utf-8") as f:
+            f.write("synced")
+        assert self.cache.load(self.cache.fingerprint()) is None
+
+    def test_missing_content_file(self) -> None:
+        self.cache.store(self.status, self.cache.fingerprint())
+        os.remove(self.content_files[0])
+        assert self.cache.fingerprint() is None
+        assert self.cache.load(self.cache.fingerprint()) is None
+
+    def test_corrupt_cache(self) -> None:
+        os.makedirs(os.path.dirname(self.cache.file))
+        with open(self.cache.file, "w", encoding="utf-8") as f:
+            f.write("{")
+        assert self.cache.load(self.cache.fingerprint()) is None